@@ -9,16 +9,88 @@ import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox
 from PIL import Image, ImageTk
 import threading
+import hashlib
 import io
+import os
+import re
+import shutil
+import tempfile
+from collections import OrderedDict
+from concurrent.futures import Future
+from functools import cached_property
+from importlib.metadata import version
+from importlib.util import find_spec
+from pathlib import Path
+import transformers
 from transformers import pipeline, AutoTokenizer, AutoModelForSequenceClassification, AutoModelForTokenClassification, AutoModelForMaskedLM, AutoProcessor
 import torch
 
+try:
+    import onnxruntime
+    from optimum.onnxruntime import ORTQuantizer, ORTModelForSequenceClassification, ORTModelForTokenClassification, ORTModelForMaskedLM
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+    ORT_MODEL_CLASSES = {
+        "text-classification": ORTModelForSequenceClassification,
+        "ner": ORTModelForTokenClassification,
+        "fill-mask": ORTModelForMaskedLM,
+    }
+except ImportError:
+    ORT_MODEL_CLASSES = {}
+
+try:
+    import cpuinfo
+except ImportError:
+    cpuinfo = None
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# low_cpu_mem_usage and device_map both need accelerate, which is not a hard dependency
+HAS_ACCELERATE = find_spec("accelerate") is not None
+
+TORCH_MODEL_CLASSES = {
+    "text-classification": AutoModelForSequenceClassification,
+    "ner": AutoModelForTokenClassification,
+    "fill-mask": AutoModelForMaskedLM,
+}
+
+# A boundary is a terminator followed by whitespace and a capital; abbreviations and initialisms are not boundaries
+SENTENCE_BOUNDARY_RE = re.compile(r"(?<=[.!?])\s+(?=[A-Z])")
+INITIALISM_RE = re.compile(r"(?:[A-Za-z]\.)+")
+ABBREVIATIONS = frozenset({"mr.", "mrs.", "ms.", "dr.", "prof.", "st.", "jr.", "sr.", "vs.", "etc.", "inc.", "ltd.", "co.", "corp.", "gen.", "gov.", "sen.", "rep.", "no."})
+MAX_BATCH_SIZE = 16
+# Physical cores only; hyperthread siblings contend for the same matmul units
+INFERENCE_THREADS = max(1, (os.cpu_count() or 2) // 2)
+RESULT_CACHE_SIZE = 128
+ONNX_CACHE_DIR = Path.home() / ".cache" / "nlp_suite"
+# Set to "auto" to shard a swapped-in model that does not fit on one GPU; the BERT-base defaults do
+MODEL_DEVICE_MAP = None
+
+ENV_KEYWORDS = ("climate", "pollution", "earth", "global warming", "deforestation", "recycle", "environment", "sustainability", "carbon", "emissions", "renewable", "biodiversity")
+# Anchored only at the start so inflections like "environmental" or "renewables" still count
+ENV_KEYWORD_RE = re.compile(r"\b(?:" + "|".join(map(re.escape, ENV_KEYWORDS)) + ")")
+ENV_KEYWORD_AUTOMATON = None
+if ahocorasick is not None:
+    ENV_KEYWORD_AUTOMATON = ahocorasick.Automaton()
+    for keyword in ENV_KEYWORDS:
+        ENV_KEYWORD_AUTOMATON.add_word(keyword, keyword)
+    ENV_KEYWORD_AUTOMATON.make_automaton()
+
 class ModernNLPApp:
     def __init__(self, root):
         self.root = root
         self.root.title("🌿 Multi-Task NLP Professional Suite")
         self.root.geometry("1000x700")
         self.root.configure(bg='#f0f0f0')
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+
+        self._closed = False
+        self._model_futures = {}
+        self._result_caches = {}
+        self._input_cache = {}
+        self.tab_models = {}
 
         self.setup_styles()
         self.init_models()
@@ -42,17 +114,291 @@ class ModernNLPApp:
         style.map('Modern.TNotebook.Tab', background=[('selected', accent_color), ('active', '#e3f2fd')], foreground=[('selected', 'white')])
 
     def init_models(self):
+        # Pipelines are built lazily on background threads when their tab is first opened
+        torch.set_num_threads(INFERENCE_THREADS)
+        self.image_gen = None  # Optional placeholder
+
+    @cached_property
+    def env_classifier(self):
+        self.show_loading_message("environment classifier")
+        return self.load_pipeline("text-classification", "nlptown/bert-base-multilingual-uncased-sentiment")
+
+    @cached_property
+    def ner(self):
+        self.show_loading_message("named entity recognizer")
+        return self.load_pipeline("ner", "dslim/bert-base-NER", grouped_entities=True)
+
+    @cached_property
+    def mask_filler(self):
+        self.show_loading_message("mask filler")
+        return self.load_pipeline("fill-mask", "bert-base-uncased")
+
+    def prefetch_model(self, name):
+        future = self._model_futures.get(name)
+        if future is None:
+            future = self._model_futures[name] = Future()
+            # Daemon threads so closing the window mid-export or mid-warm-up exits the process immediately
+            threading.Thread(target=self.load_model, args=(name, future), daemon=True).start()
+        return future
+
+    def load_model(self, name, future):
         try:
-            self.show_loading_message("Loading NLP models...")
-            self.env_classifier = pipeline("text-classification", model="nlptown/bert-base-multilingual-uncased-sentiment")
-            self.ner = pipeline("ner", grouped_entities=True)
-            self.mask_filler = pipeline("fill-mask", model="bert-base-uncased")
-            try:
-                self.image_gen = None  # Optional placeholder
-            except:
-                self.image_gen = None
+            future.set_result(getattr(self, name))
         except Exception as e:
-            messagebox.showerror("Error", f"Failed to load models: {str(e)}")
+            future.set_exception(e)
+
+    def post(self, callback, *args):
+        if self._closed:
+            return
+        try:
+            self.root.after(0, callback, *args)
+        except (RuntimeError, tk.TclError):
+            pass  # The window was closed while the worker was running
+
+    def on_tab_changed(self, event):
+        name = self.tab_models.get(self.notebook.select())
+        if name:
+            self.prefetch_model(name)
+
+    def show_loading_dialog(self, future):
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Loading")
+        dialog.transient(self.root)
+        dialog.resizable(False, False)
+        # The dialog closes itself once loading finishes
+        dialog.protocol("WM_DELETE_WINDOW", lambda: None)
+        ttk.Label(dialog, text="Loading model, please wait…").pack(padx=20, pady=(20, 10))
+        progress = ttk.Progressbar(dialog, mode='indeterminate', length=250)
+        progress.pack(padx=20, pady=(0, 20))
+        progress.start(10)
+        dialog.grab_set()
+
+        def poll():
+            if not dialog.winfo_exists():
+                return
+            if not future.done():
+                self.root.after(100, poll)
+                return
+            dialog.grab_release()
+            dialog.destroy()
+
+        poll()
+
+    def run_inference(self, button, name, fn, on_done, error_message):
+        button.config(state=tk.DISABLED)
+        future = self.prefetch_model(name)
+        if not future.done():
+            self.show_loading_dialog(future)
+
+        def finish(result, error):
+            button.config(state=tk.NORMAL)
+            if error is not None:
+                messagebox.showerror("Error", error)
+                return
+            try:
+                on_done(result)
+            except Exception as e:
+                messagebox.showerror("Error", f"{error_message}: {str(e)}")
+
+        def work():
+            try:
+                future.result()
+            except Exception as e:
+                # Forget the failed load so the next click retries it
+                self._model_futures.pop(name, None)
+                self._result_caches.pop(name, None)
+                self.post(finish, None, f"Failed to load models: {str(e)}")
+                return
+            try:
+                with torch.inference_mode():
+                    result = fn()
+            except Exception as e:
+                self.post(finish, None, f"{error_message}: {str(e)}")
+            else:
+                self.post(finish, result, None)
+
+        threading.Thread(target=work, daemon=True).start()
+
+    def inference_batch_size(self, count):
+        limit = MAX_BATCH_SIZE
+        if torch.cuda.is_available():
+            # Roughly 256 MB of activations per BERT-base sequence at full length
+            free, _ = torch.cuda.mem_get_info()
+            limit = max(1, min(4 * MAX_BATCH_SIZE, free // (256 * 1024 ** 2)))
+        return max(1, min(count, limit))
+
+    def cached_inference(self, name, fn, text):
+        # Keyed by digest so long pasted inputs are not kept alive by the cache
+        cache = self._result_caches.setdefault(name, OrderedDict())
+        key = hashlib.blake2b(text.encode(), digest_size=16).digest()
+        if key in cache:
+            cache.move_to_end(key)
+            return cache[key]
+        result = cache[key] = tuple(fn(text))
+        if len(cache) > RESULT_CACHE_SIZE:
+            cache.popitem(last=False)
+        return result
+
+    def split_sentences(self, text):
+        sentences, start = [], 0
+        for boundary in SENTENCE_BOUNDARY_RE.finditer(text):
+            last_word = text[start:boundary.start()].rsplit(None, 1)[-1]
+            if last_word.lower() in ABBREVIATIONS or INITIALISM_RE.fullmatch(last_word):
+                continue
+            sentences.append((start, text[start:boundary.start()]))
+            start = boundary.end()
+        if text[start:].strip():
+            sentences.append((start, text[start:]))
+        return sentences
+
+    def run_ner(self, text):
+        sentences = self.split_sentences(text)
+        if len(sentences) <= 1:
+            return self.ner(text)
+        batched = self.ner([sentence for _, sentence in sentences], batch_size=self.inference_batch_size(len(sentences)))
+        entities = []
+        for (offset, _), sentence_entities in zip(sentences, batched):
+            for entity in sentence_entities:
+                entity = dict(entity)
+                if entity.get("start") is not None:
+                    entity["start"] += offset
+                    entity["end"] += offset
+                entities.append(entity)
+        return entities
+
+    def run_fill_mask(self, text):
+        # Each [MASK] line is predicted with the plain lines before it; trailing plain lines go with the last one
+        segments, context = [], []
+        for line in text.splitlines():
+            context.append(line)
+            if "[MASK]" in line:
+                segments.append((line.strip(), "\n".join(context).strip()))
+                context = []
+        if context:
+            label, segment = segments[-1]
+            segments[-1] = (label, "\n".join([segment, *context]).strip())
+        labels = [label for label, _ in segments]
+        inputs = [segment for _, segment in segments]
+        if len(inputs) == 1:
+            outputs = [self.mask_filler(inputs[0])]
+        else:
+            outputs = self.mask_filler(inputs, batch_size=self.inference_batch_size(len(inputs)))
+        batches = []
+        for line, predictions in zip(labels, outputs):
+            if predictions and isinstance(predictions[0], list):
+                # Inputs with several [MASK] tokens get one prediction list per mask
+                batches.extend((f"{line} (mask {i})", mask_predictions) for i, mask_predictions in enumerate(predictions, 1))
+            else:
+                batches.append((line, predictions))
+        return batches
+
+    def on_close(self):
+        self._closed = True
+        self.root.destroy()
+
+    @cached_property
+    def cpu_flags(self):
+        return set(cpuinfo.get_cpu_info().get("flags", [])) if cpuinfo else set()
+
+    def torch_device_and_dtype(self):
+        if torch.cuda.is_available():
+            return 0, torch.float16
+        if self.cpu_flags & {"avx512_bf16", "amx_bf16"}:
+            return -1, torch.bfloat16
+        return -1, torch.float32
+
+    def quantization_config(self):
+        if self.cpu_flags & {"avx512_vnni", "avx512vnni"}:
+            return AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+        return AutoQuantizationConfig.avx2(is_static=False, per_channel=False)
+
+    def ort_session_options(self):
+        options = onnxruntime.SessionOptions()
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.intra_op_num_threads = INFERENCE_THREADS
+        return options
+
+    def load_pipeline(self, task, model_id, **kwargs):
+        ort_model_class = ORT_MODEL_CLASSES.get(task)
+        # Dynamic INT8 quantization only targets the CPU provider, so CUDA boxes stay on half-precision PyTorch
+        if ort_model_class is None or torch.cuda.is_available():
+            device, dtype = self.torch_device_and_dtype()
+            model_kwargs = {}
+            if MODEL_DEVICE_MAP and HAS_ACCELERATE and torch.cuda.is_available():
+                # accelerate places the layers; the pipeline must not move them again
+                model_kwargs["device_map"] = MODEL_DEVICE_MAP
+                device = None
+            if HAS_ACCELERATE:
+                # Maps safetensors weights straight into the model instead of building it twice
+                model_kwargs["low_cpu_mem_usage"] = True
+            model = self.load_pretrained(TORCH_MODEL_CLASSES[task], model_id, torch_dtype=dtype, **model_kwargs)
+            tokenizer = self.load_pretrained(AutoTokenizer, model_id)
+            return self.compile_pipeline(pipeline(task, model=model, tokenizer=tokenizer, device=device, **kwargs))
+        # Export to ONNX and apply dynamic INT8 quantization; falls back to PyTorch above when optimum is missing
+        quantization_config = self.quantization_config()
+        # Library upgrades or a different CPU config produce a new key, so stale exports are never reused
+        cache_key = hashlib.sha256(f"{transformers.__version__}|{version('optimum')}|{onnxruntime.__version__}|{model_id}|{quantization_config!r}".encode()).hexdigest()[:16]
+        save_dir = ONNX_CACHE_DIR / model_id.replace("/", "_") / cache_key
+        if not (save_dir / "model_quantized.onnx").exists():
+            save_dir.parent.mkdir(parents=True, exist_ok=True)
+            # Quantize into a scratch dir and rename it so an interrupted export never looks complete
+            scratch_dir = tempfile.mkdtemp(dir=save_dir.parent)
+            try:
+                quantizer = ORTQuantizer.from_pretrained(ort_model_class.from_pretrained(model_id, export=True))
+                quantizer.quantize(save_dir=scratch_dir, quantization_config=quantization_config)
+                try:
+                    os.replace(scratch_dir, save_dir)
+                except OSError:
+                    # Another instance finished the same export first; its copy is just as good
+                    if not (save_dir / "model_quantized.onnx").exists():
+                        raise
+            finally:
+                shutil.rmtree(scratch_dir, ignore_errors=True)
+        model = ort_model_class.from_pretrained(save_dir, file_name="model_quantized.onnx", session_options=self.ort_session_options())
+        tokenizer = self.load_pretrained(AutoTokenizer, model_id)
+        nlp = pipeline(task, model=model, tokenizer=tokenizer, **kwargs)
+        self.warm_up(nlp)
+        return nlp
+
+    def load_pretrained(self, cls, model_id, **kwargs):
+        # Skip the hub round-trips once the files are in the local cache
+        try:
+            return cls.from_pretrained(model_id, local_files_only=True, **kwargs)
+        except OSError:
+            return cls.from_pretrained(model_id, **kwargs)
+
+    def warm_up(self, nlp, runs=2):
+        sample = "The earth is warming quickly in London."
+        if nlp.task == "fill-mask":
+            sample = f"The earth is {nlp.tokenizer.mask_token}."
+        with torch.inference_mode():
+            for _ in range(runs):
+                nlp(sample)
+                # Also trace a real batch; a batch of one is specialized and would recompile on the first batched click
+                nlp([sample, sample], batch_size=2)
+
+    def compile_pipeline(self, nlp):
+        if not hasattr(torch, "compile"):
+            self.warm_up(nlp)
+            return nlp
+        from torch._dynamo.exc import TorchDynamoException
+
+        # Compile only forward so the pipeline still sees a regular PreTrainedModel
+        eager_forward = nlp.model.forward
+        compiled_forward = torch.compile(eager_forward, dynamic=True)
+
+        def forward(*args, **kwargs):
+            try:
+                return compiled_forward(*args, **kwargs)
+            except TorchDynamoException as e:
+                # Only compiler failures switch to eager; input errors and OOM propagate as usual
+                print(f"torch.compile failed, falling back to eager mode: {e}")
+                nlp.model.forward = eager_forward
+                return eager_forward(*args, **kwargs)
+
+        nlp.model.forward = forward
+        self.warm_up(nlp)
+        return nlp
 
     def show_loading_message(self, message):
         print(f"Loading: {message}")
@@ -66,6 +412,7 @@ class ModernNLPApp:
         subtitle_label.pack(pady=(0, 20))
         self.notebook = ttk.Notebook(main_frame, style='Modern.TNotebook')
         self.notebook.pack(fill=tk.BOTH, expand=True)
+        self.notebook.bind("<<NotebookTabChanged>>", self.on_tab_changed)
         self.create_env_classifier_tab()
         self.create_image_gen_tab()
         self.create_ner_tab()
@@ -82,6 +429,7 @@ class ModernNLPApp:
         input_frame.pack(fill=tk.X, pady=(0, 20))
         self.env_text_input = scrolledtext.ScrolledText(input_frame, height=4, font=('Segoe UI', 10), wrap=tk.WORD)
         self.env_text_input.pack(fill=tk.X, pady=(0, 10))
+        self.watch_input(self.env_text_input)
         analyze_btn = ttk.Button(input_frame, text="🔍 Analyze Text", style='Modern.TButton', command=self.classify_environment)
         analyze_btn.pack()
         results_frame = ttk.LabelFrame(content_frame, text="Classification Results", padding=10)
@@ -100,6 +448,7 @@ class ModernNLPApp:
         input_frame.pack(fill=tk.X, pady=(0, 20))
         self.image_prompt_input = scrolledtext.ScrolledText(input_frame, height=3, font=('Segoe UI', 10), wrap=tk.WORD)
         self.image_prompt_input.pack(fill=tk.X, pady=(0, 10))
+        self.watch_input(self.image_prompt_input)
         generate_btn = ttk.Button(input_frame, text="🎨 Generate Image", style='Success.TButton', command=self.generate_image)
         generate_btn.pack()
         image_frame = ttk.LabelFrame(content_frame, text="Generated Image", padding=10)
@@ -110,6 +459,7 @@ class ModernNLPApp:
     def create_ner_tab(self):
         tab_frame = ttk.Frame(self.notebook)
         self.notebook.add(tab_frame, text="🏷️ Named Entities")
+        self.tab_models[str(tab_frame)] = "ner"
         content_frame = ttk.Frame(tab_frame)
         content_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
         title = ttk.Label(content_frame, text="Named Entity Recognition", style='Title.TLabel')
@@ -118,8 +468,9 @@ class ModernNLPApp:
         input_frame.pack(fill=tk.X, pady=(0, 20))
         self.ner_text_input = scrolledtext.ScrolledText(input_frame, height=4, font=('Segoe UI', 10), wrap=tk.WORD)
         self.ner_text_input.pack(fill=tk.X, pady=(0, 10))
-        extract_btn = ttk.Button(input_frame, text="🏷️ Extract Entities", style='Modern.TButton', command=self.extract_entities)
-        extract_btn.pack()
+        self.watch_input(self.ner_text_input)
+        self.extract_btn = ttk.Button(input_frame, text="🏷️ Extract Entities", style='Modern.TButton', command=self.extract_entities)
+        self.extract_btn.pack()
         results_frame = ttk.LabelFrame(content_frame, text="Extracted Entities", padding=10)
         results_frame.pack(fill=tk.BOTH, expand=True, pady=(10, 0))
         self.ner_results = scrolledtext.ScrolledText(results_frame, height=6, font=('Segoe UI', 10), wrap=tk.WORD, state=tk.DISABLED)
@@ -128,6 +479,7 @@ class ModernNLPApp:
     def create_mask_fill_tab(self):
         tab_frame = ttk.Frame(self.notebook)
         self.notebook.add(tab_frame, text="🎭 Fill Mask")
+        self.tab_models[str(tab_frame)] = "mask_filler"
         content_frame = ttk.Frame(tab_frame)
         content_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
         title = ttk.Label(content_frame, text="Masked Language Model", style='Title.TLabel')
@@ -138,77 +490,102 @@ class ModernNLPApp:
         input_frame.pack(fill=tk.X, pady=(0, 20))
         self.mask_text_input = scrolledtext.ScrolledText(input_frame, height=3, font=('Segoe UI', 10), wrap=tk.WORD)
         self.mask_text_input.pack(fill=tk.X, pady=(0, 10))
-        predict_btn = ttk.Button(input_frame, text="🎭 Predict Mask", style='Success.TButton', command=self.fill_mask)
-        predict_btn.pack()
+        self.watch_input(self.mask_text_input)
+        self.predict_btn = ttk.Button(input_frame, text="🎭 Predict Mask", style='Success.TButton', command=self.fill_mask)
+        self.predict_btn.pack()
         results_frame = ttk.LabelFrame(content_frame, text="Predictions", padding=10)
         results_frame.pack(fill=tk.BOTH, expand=True, pady=(10, 0))
         self.mask_results = scrolledtext.ScrolledText(results_frame, height=6, font=('Segoe UI', 10), wrap=tk.WORD, state=tk.DISABLED)
         self.mask_results.pack(fill=tk.BOTH, expand=True)
 
+    def watch_input(self, widget):
+        widget.bind("<<Modified>>", lambda event: self.mark_dirty(widget))
+
+    def mark_dirty(self, widget):
+        # Resetting the flag fires <<Modified>> again, hence the guard
+        if widget.edit_modified():
+            self._input_cache.pop(str(widget), None)
+            widget.edit_modified(False)
+
+    def read_input(self, widget):
+        text = self._input_cache.get(str(widget))
+        if text is None:
+            text = self._input_cache[str(widget)] = widget.get(1.0, tk.END).strip()
+        return text
+
     def update_results(self, text_widget, content):
         text_widget.config(state=tk.NORMAL)
-        text_widget.delete(1.0, tk.END)
-        text_widget.insert(tk.END, content)
+        text_widget.replace(1.0, 'end-1c', content)
         text_widget.config(state=tk.DISABLED)
 
     def classify_environment(self):
-        text = self.env_text_input.get(1.0, tk.END).strip()
+        text = self.read_input(self.env_text_input)
         if not text:
             messagebox.showwarning("Warning", "Please enter some text to analyze.")
             return
         try:
-            keywords = ["climate", "pollution", "earth", "global warming", "deforestation", "recycle", "environment", "sustainability", "carbon", "emissions", "renewable", "biodiversity"]
-            score = sum(1 for kw in keywords if kw in text.lower())
+            found = self.find_env_keywords(text.lower())
+            score = len(found)
             confidence = min(score / 3, 1.0)
             if score > 0:
                 result = f"Classification: Environment-related\nConfidence: {confidence:.2f}\nKeywords found: {score}\n\n"
-                result += f"Environmental keywords detected: {', '.join([kw for kw in keywords if kw in text.lower()])}"
+                result += f"Environmental keywords detected: {', '.join([kw for kw in ENV_KEYWORDS if kw in found])}"
             else:
                 result = f"Classification: Not Environment-related\nConfidence: {1-confidence:.2f}\n\nNo environmental keywords detected."
             self.update_results(self.env_results, result)
         except Exception as e:
             messagebox.showerror("Error", f"Classification failed: {str(e)}")
 
+    def find_env_keywords(self, text_lc):
+        if ENV_KEYWORD_AUTOMATON is None:
+            return set(ENV_KEYWORD_RE.findall(text_lc))
+        found = set()
+        for end, keyword in ENV_KEYWORD_AUTOMATON.iter(text_lc):
+            # Same word-start rule as ENV_KEYWORD_RE's leading \b
+            start = end - len(keyword) + 1
+            if start == 0 or not (text_lc[start - 1].isalnum() or text_lc[start - 1] == "_"):
+                found.add(keyword)
+        return found
+
     def generate_image(self):
-        prompt = self.image_prompt_input.get(1.0, tk.END).strip()
+        prompt = self.read_input(self.image_prompt_input)
         if not prompt:
             messagebox.showwarning("Warning", "Please enter an image prompt.")
             return
         self.image_label.config(text=f"Generating image for: '{prompt}'\n\n(Image generation placeholder)")
 
     def extract_entities(self):
-        text = self.ner_text_input.get(1.0, tk.END).strip()
+        text = self.read_input(self.ner_text_input)
         if not text:
             messagebox.showwarning("Warning", "Please enter some text to analyze.")
             return
-        try:
-            entities = self.ner(text)
-            if entities:
-                result = "Extracted Entities:\n" + "="*50 + "\n\n"
-                for i, entity in enumerate(entities, 1):
-                    result += f"{i}. {entity['entity_group']}: {entity['word']}\n"
-                    result += f"   Confidence: {entity['score']:.3f}\n\n"
-            else:
-                result = "No named entities found in the text."
-            self.update_results(self.ner_results, result)
-        except Exception as e:
-            messagebox.showerror("Error", f"Entity extraction failed: {str(e)}")
+        self.run_inference(self.extract_btn, "ner", lambda: self.cached_inference("ner", self.run_ner, text), self.show_entities, "Entity extraction failed")
+
+    def show_entities(self, entities):
+        if entities:
+            parts = ["Extracted Entities:\n", "="*50, "\n\n"]
+            for i, entity in enumerate(entities, 1):
+                parts.append(f"{i}. {entity['entity_group']}: {entity['word']}\n   Confidence: {entity['score']:.3f}\n\n")
+            result = "".join(parts)
+        else:
+            result = "No named entities found in the text."
+        self.update_results(self.ner_results, result)
 
     def fill_mask(self):
-        text = self.mask_text_input.get(1.0, tk.END).strip()
+        text = self.read_input(self.mask_text_input)
         if not text or "[MASK]" not in text:
             messagebox.showwarning("Warning", "Please include [MASK] in your text.")
             return
-        try:
-            predictions = self.mask_filler(text)
-            result = "Mask Predictions:\n" + "="*50 + "\n\n"
+        self.run_inference(self.predict_btn, "mask_filler", lambda: self.cached_inference("mask_filler", self.run_fill_mask, text), self.show_predictions, "Mask filling failed")
+
+    def show_predictions(self, batches):
+        parts = ["Mask Predictions:\n", "="*50, "\n\n"]
+        for line, predictions in batches:
+            if len(batches) > 1:
+                parts.append(f"{line}\n" + "-"*50 + "\n")
             for i, pred in enumerate(predictions, 1):
-                result += f"{i}. {pred['sequence']}\n"
-                result += f"   Confidence: {pred['score']:.3f}\n"
-                result += f"   Token: {pred['token_str']}\n\n"
-            self.update_results(self.mask_results, result)
-        except Exception as e:
-            messagebox.showerror("Error", f"Mask filling failed: {str(e)}")
+                parts.append(f"{i}. {pred['sequence']}\n   Confidence: {pred['score']:.3f}\n   Token: {pred['token_str']}\n\n")
+        self.update_results(self.mask_results, "".join(parts))
 
 def main():
     root = tk.Tk()